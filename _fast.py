@@ -0,0 +1,57 @@
+"""
+Numba kernels for large measurement arrays.
+Importing this module raises ImportError when Numba is not installed.
+"""
+
+import numpy as np
+from numba import get_num_threads, njit, prange
+
+
+def fused_stats(arr):
+    """
+    Count 0s, 1s and bit transitions in one parallel sweep.
+    
+    The array is split into one chunk per thread. Each chunk is scanned
+    independently and the transitions across chunk boundaries are added
+    afterwards.
+    
+    Args:
+        arr (numpy.ndarray): Contiguous uint8 array of 0s and 1s
+    
+    Returns:
+        tuple: (count_0, count_1, transitions)
+    """
+    return _fused_stats_chunked(arr, get_num_threads())
+
+
+@njit(cache=True, parallel=True)
+def _fused_stats_chunked(arr, n_threads):
+    """Chunked kernel behind fused_stats, one chunk per thread."""
+    n = arr.size
+    n_chunks = max(1, min(n_threads, n))
+    chunk = (n + n_chunks - 1) // n_chunks
+    
+    ones = np.zeros(n_chunks, dtype=np.int64)
+    changes = np.zeros(n_chunks, dtype=np.int64)
+    
+    for k in prange(n_chunks):
+        start = k * chunk
+        stop = min(start + chunk, n)
+        c1 = 0
+        t = 0
+        for i in range(start, stop):
+            c1 += arr[i]
+            if i > start and arr[i] != arr[i - 1]:
+                t += 1
+        ones[k] = c1
+        changes[k] = t
+    
+    # Transitions between the last bit of one chunk and the first of the next
+    transitions = changes.sum()
+    for k in range(1, n_chunks):
+        start = k * chunk
+        if start < n and arr[start] != arr[start - 1]:
+            transitions += 1
+    
+    count_1 = ones.sum()
+    return n - count_1, count_1, transitions
@@ -5,25 +5,29 @@ Provides easy access to quantum randomness generation and analysis.
 
 import argparse
 import sys
-from quantum_core import QuantumRandomNumberGenerator
-from visualizer import QuantumVisualizer
-from utils import FileManager, RandomnessTests, FormatConverter
+
+# Qiskit, SciPy and Matplotlib are slow to import, so the modules depending
+# on them are imported inside the command handlers that need them. This
+# keeps `--help` and argument errors fast.
 
 
 def print_header():
     """Print application header."""
     print("\n" + "="*60)
     print("  QUANTUM RANDOM NUMBER GENERATOR (QRNG)")
-    print("  Using Qiskit and Single-Qubit Measurements")
+    print("  Using Qiskit and Multi-Qubit Register Measurements")
     print("="*60 + "\n")
 
 
 def generate_command(args):
     """Handle the generate command."""
+    from quantum_core import QuantumRandomNumberGenerator
+    from utils import FileManager
+    
     print(f"Generating {args.count} quantum random bits...")
     
     # Initialize QRNG
-    qrng = QuantumRandomNumberGenerator(seed=args.seed)
+    qrng = QuantumRandomNumberGenerator(seed=args.seed, backend=args.backend)
     
     # Generate measurements
     measurements = qrng.generate_random_bits(num_measurements=args.count)
@@ -36,7 +40,7 @@ def generate_command(args):
     print("GENERATION RESULTS")
     print("-"*60)
     
-    print(f"\nBinary (first 100 bits): {qrng.to_binary_string()[:100]}")
+    print(f"\nBinary (first 100 bits): {qrng.to_binary_string(limit=100)}")
     print(f"Decimal: {qrng.to_decimal()}")
     print(f"Hexadecimal: {qrng.to_hex()}")
     print(f"Float [0,1): {qrng.to_float():.10f}")
@@ -44,11 +48,12 @@ def generate_command(args):
     print("\n" + "-"*60)
     print("STATISTICS")
     print("-"*60)
-    print(f"Total Measurements: {stats['total_measurements']}")
-    print(f"Count of 0s: {stats['count_0']} ({stats['probability_0']*100:.2f}%)")
-    print(f"Count of 1s: {stats['count_1']} ({stats['probability_1']*100:.2f}%)")
-    print(f"Shannon Entropy: {stats['shannon_entropy']:.6f} / {stats['max_entropy']:.6f}")
-    print(f"Entropy Ratio: {stats['entropy_ratio']:.4f} (Quality: {'Excellent' if stats['entropy_ratio'] > 0.95 else 'Good' if stats['entropy_ratio'] > 0.85 else 'Poor'})")
+    formatted = qrng.formatted_stats()
+    print(f"Total Measurements: {formatted.total_measurements}")
+    print(f"Count of 0s: {formatted.count_0} ({formatted.percent_0})")
+    print(f"Count of 1s: {formatted.count_1} ({formatted.percent_1})")
+    print(f"Shannon Entropy: {formatted.shannon_entropy} / {formatted.max_entropy}")
+    print(f"Entropy Ratio: {formatted.entropy_ratio} (Quality: {formatted.quality})")
     
     # Save if requested
     if args.save:
@@ -66,25 +71,31 @@ def generate_command(args):
 
 def analyze_command(args):
     """Handle the analyze command."""
+    from quantum_core import QuantumRandomNumberGenerator
+    from utils import RandomnessTests
+    
     print(f"Analyzing randomness quality of {args.count} measurements...")
     
     # Generate measurements
-    qrng = QuantumRandomNumberGenerator(seed=args.seed)
+    qrng = QuantumRandomNumberGenerator(seed=args.seed, backend=args.backend)
     measurements = qrng.generate_random_bits(num_measurements=args.count)
     
     print("\n" + "-"*60)
     print("RANDOMNESS QUALITY TESTS")
     print("-"*60)
     
+    # Run all tests in a single pass over the measurements
+    results = RandomnessTests.all_tests(measurements)
+    
     # Chi-square test
-    chi_square = RandomnessTests.chi_square_test(measurements)
+    chi_square = results['chi_square']
     print(f"\nChi-Square Test:")
     print(f"  Chi-Square Statistic: {chi_square['chi_square_statistic']:.6f}")
     print(f"  P-Value: {chi_square['p_value']:.6f}")
     print(f"  Result: {'PASS' if chi_square['passes_test'] else 'FAIL'} ({chi_square['interpretation']})")
     
     # Runs test
-    runs = RandomnessTests.runs_test(measurements)
+    runs = results['runs']
     print(f"\nRuns Test:")
     print(f"  Runs Count: {runs['runs_count']}")
     print(f"  Expected Runs: {runs['expected_runs']:.2f}")
@@ -93,7 +104,7 @@ def analyze_command(args):
     print(f"  Result: {'PASS' if runs['passes_test'] else 'FAIL'} ({runs['interpretation']})")
     
     # Entropy test
-    entropy = RandomnessTests.entropy_test(measurements)
+    entropy = results['entropy']
     print(f"\nEntropy Test:")
     print(f"  Shannon Entropy: {entropy['shannon_entropy']:.6f}")
     print(f"  Max Entropy: {entropy['max_entropy']:.6f}")
@@ -109,51 +120,79 @@ def analyze_command(args):
 
 def visualize_command(args):
     """Handle the visualize command."""
+    # Plots are only saved to files, so skip any interactive GUI backend
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.figure import Figure
+    from quantum_core import QuantumRandomNumberGenerator
+    from visualizer import QuantumVisualizer
+    
     print(f"Generating visualizations for {args.count} measurements...")
     
     # Generate measurements
-    qrng = QuantumRandomNumberGenerator(seed=args.seed)
+    qrng = QuantumRandomNumberGenerator(seed=args.seed, backend=args.backend)
     measurements = qrng.generate_random_bits(num_measurements=args.count)
     stats = qrng.get_statistics()
     
-    # Create visualizations
+    # Create visualizations, redrawing one figure for the saved-only plots
+    fig = Figure()
+    
     print("Creating measurement histogram...")
     QuantumVisualizer.plot_measurement_histogram(measurements, 
-                                                 save_path=args.output + "_histogram.png")
+                                                 save_path=args.output + "_histogram.png",
+                                                 reuse_fig=fig)
     
     print("Creating Bloch sphere visualization...")
     QuantumVisualizer.plot_bloch_sphere(save_path=args.output + "_bloch.png")
     
     print("Creating statistics plot...")
-    QuantumVisualizer.plot_statistics(stats, save_path=args.output + "_stats.png")
+    QuantumVisualizer.plot_statistics(stats, save_path=args.output + "_stats.png",
+                                      reuse_fig=fig)
     
     print("Creating bit sequence analysis...")
-    QuantumVisualizer.plot_bit_sequence(measurements, save_path=args.output + "_sequence.png")
+    QuantumVisualizer.plot_bit_sequence(measurements, save_path=args.output + "_sequence.png",
+                                        reuse_fig=fig)
     
     print(f"\nVisualizations saved with prefix: {args.output}")
 
 
-def compare_command(args):
-    """Handle the compare command."""
+def compare_command(args, measurements=None):
+    """
+    Handle the compare command.
+    
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments
+        measurements (numpy.ndarray, optional): Previously generated uint8
+            measurements to reuse instead of generating a new quantum batch
+    """
+    from quantum_core import QuantumRandomNumberGenerator
+    from utils import RandomnessTests
+    
     print(f"Comparing quantum vs classical randomness ({args.count} samples each)...")
     
-    # Generate quantum random numbers
-    qrng = QuantumRandomNumberGenerator(seed=args.seed)
-    quantum_measurements = qrng.generate_random_bits(num_measurements=args.count)
+    # Reuse quantum random numbers when a matching batch is supplied; the
+    # simulator is only needed to generate a new batch
+    if measurements is not None and len(measurements) == args.count:
+        qrng = QuantumRandomNumberGenerator(backend='fast')
+        qrng.set_measurements(measurements)
+    else:
+        qrng = QuantumRandomNumberGenerator(seed=args.seed, backend=args.backend)
+        qrng.generate_random_bits(num_measurements=args.count)
     quantum_stats = qrng.get_statistics()
     
     # Get classical random statistics
-    classical_stats = RandomnessTests.compare_with_classical_random(args.count)
+    classical_stats = RandomnessTests.compare_with_classical_random(args.count, seed=args.seed)
     
     print("\n" + "-"*60)
     print("QUANTUM vs CLASSICAL RANDOMNESS")
     print("-"*60)
     
     print(f"\nQuantum Random Numbers ({args.count} samples):")
-    print(f"  Count of 0s: {quantum_stats['count_0']} ({quantum_stats['probability_0']*100:.2f}%)")
-    print(f"  Count of 1s: {quantum_stats['count_1']} ({quantum_stats['probability_1']*100:.2f}%)")
-    print(f"  Shannon Entropy: {quantum_stats['shannon_entropy']:.6f}")
-    print(f"  Entropy Ratio: {quantum_stats['entropy_ratio']:.4f}")
+    formatted = qrng.formatted_stats()
+    print(f"  Count of 0s: {formatted.count_0} ({formatted.percent_0})")
+    print(f"  Count of 1s: {formatted.count_1} ({formatted.percent_1})")
+    print(f"  Shannon Entropy: {formatted.shannon_entropy}")
+    print(f"  Entropy Ratio: {formatted.entropy_ratio}")
     
     print(f"\nClassical Random Numbers ({args.count} samples):")
     print(f"  Count of 0s: {classical_stats['count_0']} ({classical_stats['probability_0']*100:.2f}%)")
@@ -179,6 +218,7 @@ Examples:
   python main.py analyze --count 2048
   python main.py visualize --count 1024 --output qrng
   python main.py compare --count 512
+  python main.py generate --count 10000 --backend fast
         """
     )
     
@@ -190,6 +230,8 @@ Examples:
                            help='Number of measurements (default: 1024)')
     gen_parser.add_argument('--seed', type=int, default=None,
                            help='Random seed for reproducibility')
+    gen_parser.add_argument('--backend', choices=['aer', 'fast'], default='aer',
+                           help="'aer' simulates the circuit, 'fast' samples equivalent coin flips (default: aer)")
     gen_parser.add_argument('--save', type=str, help='Save measurements to JSON file')
     gen_parser.add_argument('--binary', type=str, help='Save as binary file')
     gen_parser.add_argument('--hex', type=str, help='Save as hexadecimal file')
@@ -201,6 +243,8 @@ Examples:
                            help='Number of measurements (default: 2048)')
     ana_parser.add_argument('--seed', type=int, default=None,
                            help='Random seed for reproducibility')
+    ana_parser.add_argument('--backend', choices=['aer', 'fast'], default='aer',
+                           help="'aer' simulates the circuit, 'fast' samples equivalent coin flips (default: aer)")
     ana_parser.set_defaults(func=analyze_command)
     
     # Visualize command
@@ -209,6 +253,8 @@ Examples:
                            help='Number of measurements (default: 1024)')
     vis_parser.add_argument('--seed', type=int, default=None,
                            help='Random seed for reproducibility')
+    vis_parser.add_argument('--backend', choices=['aer', 'fast'], default='aer',
+                           help="'aer' simulates the circuit, 'fast' samples equivalent coin flips (default: aer)")
     vis_parser.add_argument('--output', type=str, default='qrng',
                            help='Output file prefix (default: qrng)')
     vis_parser.set_defaults(func=visualize_command)
@@ -219,6 +265,8 @@ Examples:
                            help='Number of samples for each (default: 1024)')
     cmp_parser.add_argument('--seed', type=int, default=None,
                            help='Random seed for reproducibility')
+    cmp_parser.add_argument('--backend', choices=['aer', 'fast'], default='aer',
+                           help="'aer' simulates the circuit, 'fast' samples equivalent coin flips (default: aer)")
     cmp_parser.set_defaults(func=compare_command)
     
     args = parser.parse_args()
@@ -1,29 +1,107 @@
 """
 Core quantum random number generator using Qiskit.
-Implements single-qubit measurements with Hadamard gate for true quantum randomness.
+Measures a register of qubits in Hadamard superposition for true quantum randomness.
 """
 
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
 from qiskit_aer import AerSimulator
 import numpy as np
 
 
+# Byte translation table mapping a 0 byte to '0' and any other byte to '1'
+_BIT_TO_ASCII = bytes.maketrans(bytes(range(256)), b'0' + b'1' * 255)
+
+
+@lru_cache(maxsize=None)
+def _measurement_circuit(num_qubits):
+    """
+    Build the Hadamard + measurement circuit once per register width.
+    
+    Aer runs the circuit as built, so one instance is shared by every
+    generator with the same register width.
+    
+    Args:
+        num_qubits (int): Number of qubits (and classical bits) in the register
+    
+    Returns:
+        QuantumCircuit: Circuit measuring every qubit in superposition
+    """
+    # Create quantum circuit with one classical bit per qubit
+    qr = QuantumRegister(num_qubits, 'q')
+    cr = ClassicalRegister(num_qubits, 'c')
+    circuit = QuantumCircuit(qr, cr)
+    
+    # Apply Hadamard gates to put every qubit in superposition
+    circuit.h(qr)
+    
+    # Measure the qubits
+    circuit.measure(qr, cr)
+    
+    return circuit
+
+
+@dataclass(frozen=True)
+class FormattedStatistics:
+    """Display-ready strings for the statistics of one measurement batch."""
+    
+    total_measurements: str
+    count_0: str
+    count_1: str
+    percent_0: str
+    percent_1: str
+    probability_0: str
+    probability_1: str
+    shannon_entropy: str
+    max_entropy: str
+    entropy_ratio: str
+    quality: str
+
+
 class QuantumRandomNumberGenerator:
     """
     Generates random numbers using quantum mechanics principles.
-    Uses a single qubit in superposition (Hadamard gate) and measures it.
+    Uses qubits in superposition (Hadamard gate) and measures them, each
+    qubit measurement contributing one independent random bit.
     """
     
-    def __init__(self, seed=None):
+    # Number of qubits measured per simulator shot
+    BATCH_QUBITS = 64
+    
+    # Supported measurement backends
+    BACKENDS = ('aer', 'fast')
+    
+    def __init__(self, seed=None, backend='aer'):
         """
         Initialize the QRNG with optional seed for reproducibility.
         
         Args:
             seed (int, optional): Random seed for simulator reproducibility
+            backend (str): 'aer' to simulate the quantum circuit (default), or
+                'fast' to draw statistically equivalent fair coin flips from
+                NumPy without running the simulator
         """
-        self.simulator = AerSimulator(seed_simulator=seed)
-        self.measurements = []
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'. Choose from {self.BACKENDS}.")
+        
+        self.backend = backend
+        self.simulator = None
+        self._circuit = None
+        if backend == 'aer':
+            # Hadamard + measurement is a Clifford circuit, so the stabilizer
+            # method simulates the full register cheaply, where a statevector
+            # of 2**BATCH_QUBITS amplitudes could not be held in memory
+            self.simulator = AerSimulator(method='stabilizer', seed_simulator=seed)
+            self._circuit = _measurement_circuit(self.BATCH_QUBITS)
+        self.rng = np.random.default_rng(seed)
+        self.measurements = np.empty(0, dtype=np.uint8)
         self.counts = {}
+        self._packed_int = None
+        self._stats = None
+        self._formatted_stats = None
     
     def generate_random_bits(self, num_measurements=1024):
         """
@@ -33,43 +111,103 @@ class QuantumRandomNumberGenerator:
             num_measurements (int): Number of measurements to perform (default: 1024)
         
         Returns:
-            list: List of random bits (0 or 1)
+            numpy.ndarray: uint8 array of random bits (0 or 1)
+        """
+        if self.backend == 'fast':
+            # An ideal Hadamard + measurement is a fair Bernoulli(1/2) trial
+            measurements = self.rng.integers(0, 2, size=num_measurements, dtype=np.uint8)
+        else:
+            measurements = self._measure_circuit(num_measurements)
+        
+        count_1 = int(measurements.sum(dtype=np.int64))
+        self.counts = {'0': num_measurements - count_1, '1': count_1}
+        
+        self.measurements = measurements
+        self._packed_int = None
+        self._stats = None
+        self._formatted_stats = None
+        return self.measurements
+    
+    def set_measurements(self, measurements):
+        """
+        Use previously generated measurements instead of running a new batch.
+        
+        Args:
+            measurements (numpy.ndarray): uint8 array of measurement results (0 or 1)
         """
-        # Create quantum circuit with 1 qubit and 1 classical bit
-        qr = QuantumRegister(1, 'q')
-        cr = ClassicalRegister(1, 'c')
-        circuit = QuantumCircuit(qr, cr)
+        measurements = np.ascontiguousarray(measurements, dtype=np.uint8)
+        count_1 = int(measurements.sum(dtype=np.int64))
+        self.counts = {'0': len(measurements) - count_1, '1': count_1}
         
-        # Apply Hadamard gate to create superposition
-        circuit.h(qr[0])
+        self.measurements = measurements
+        self._packed_int = None
+        self._stats = None
+        self._formatted_stats = None
+    
+    def _measure_circuit(self, num_measurements):
+        """
+        Run the Hadamard + measurement circuit on the Aer simulator.
         
-        # Measure the qubit
-        circuit.measure(qr[0], cr[0])
+        Args:
+            num_measurements (int): Number of bits to measure
+        
+        Returns:
+            numpy.ndarray: uint8 array of measured bits
+        """
+        # Each shot measures the whole register, so the simulator needs far
+        # fewer shots for the same number of bits
+        shots = -(-num_measurements // self.BATCH_QUBITS)
         
-        # Execute the circuit multiple times
-        job = self.simulator.run(circuit, shots=num_measurements)
+        # Execute the circuit, keeping every shot's raw outcome in order
+        job = self.simulator.run(self._circuit, shots=shots, memory=True)
         result = job.result()
-        self.counts = result.get_counts(circuit)
+        memory = result.data(self._circuit)['memory']
         
-        # Extract measurements as list of bits
-        measurements = []
-        for bitstring, count in self.counts.items():
-            bit = int(bitstring)
-            measurements.extend([bit] * count)
+        # Each shot is a hex word whose bit i is qubit i (BATCH_QUBITS fits in
+        # 64 bits), so unpacking the little-endian words puts qubit 0 first
+        words = np.array([int(word, 16) for word in memory], dtype='<u8')
+        bits = np.unpackbits(words.view(np.uint8), bitorder='little')
+        return bits[:num_measurements]
+    
+    def _as_bytes(self):
+        """
+        Pack measurements into bytes (big-endian bit order, zero padded).
         
-        self.measurements = measurements
-        return measurements
+        Returns:
+            bytes: Bit-packed representation of measurements
+        """
+        if len(self.measurements) == 0:
+            raise ValueError("No measurements available. Call generate_random_bits() first.")
+        return np.packbits(self.measurements).tobytes()
     
-    def to_binary_string(self):
+    def _decimal(self):
+        """
+        Return the measurements as a single integer, computed once per batch.
+        
+        Returns:
+            int: Integer whose binary digits are the measurements
+        """
+        if self._packed_int is None:
+            # Drop the zero padding added by packbits on the last byte
+            padding = -len(self.measurements) % 8
+            self._packed_int = int.from_bytes(self._as_bytes(), 'big') >> padding
+        return self._packed_int
+    
+    def to_binary_string(self, limit=None):
         """
         Convert measurements to binary string.
         
+        Args:
+            limit (int, optional): Only stringify the first `limit` bits
+        
         Returns:
             str: Binary representation of measurements
         """
-        if not self.measurements:
+        if len(self.measurements) == 0:
             raise ValueError("No measurements available. Call generate_random_bits() first.")
-        return ''.join(map(str, self.measurements))
+        
+        bits = self.measurements if limit is None else self.measurements[:limit]
+        return bits.tobytes().translate(_BIT_TO_ASCII).decode('ascii')
     
     def to_decimal(self):
         """
@@ -78,8 +216,7 @@ class QuantumRandomNumberGenerator:
         Returns:
             int: Decimal representation of measurements
         """
-        binary_str = self.to_binary_string()
-        return int(binary_str, 2)
+        return self._decimal()
     
     def to_hex(self):
         """
@@ -88,8 +225,7 @@ class QuantumRandomNumberGenerator:
         Returns:
             str: Hexadecimal representation of measurements
         """
-        decimal = self.to_decimal()
-        return hex(decimal)
+        return hex(self._decimal())
     
     def to_float(self):
         """
@@ -98,37 +234,45 @@ class QuantumRandomNumberGenerator:
         Returns:
             float: Random float in range [0, 1)
         """
-        binary_str = self.to_binary_string()
-        # Pad to 32 bits for float conversion
-        binary_str = binary_str.ljust(32, '0')[:32]
-        decimal = int(binary_str, 2)
+        # First 32 bits, zero padded if fewer measurements are available
+        shift = len(self.measurements) - 32
+        decimal = self._decimal()
+        decimal = decimal >> shift if shift >= 0 else decimal << -shift
         return decimal / (2 ** 32)
     
     def get_statistics(self):
         """
-        Get statistical information about the measurements.
+        Get statistical information about the measurements, computed once per batch.
         
         Returns:
             dict: Statistics including counts, probabilities, and entropy
         """
-        if not self.measurements:
+        if len(self.measurements) == 0:
             raise ValueError("No measurements available. Call generate_random_bits() first.")
         
+        if self._stats is not None:
+            return self._stats
+        
         total = len(self.measurements)
-        count_0 = self.measurements.count(0)
-        count_1 = self.measurements.count(1)
+        if self.counts:
+            # Reuse the histogram aggregated when the batch was generated
+            count_0 = self.counts.get('0', 0)
+            count_1 = self.counts.get('1', 0)
+        else:
+            count_1 = int(self.measurements.sum(dtype=np.int64))
+            count_0 = total - count_1
         
         prob_0 = count_0 / total
         prob_1 = count_1 / total
         
         # Calculate Shannon entropy (max is 1.0 for perfect randomness)
-        entropy = 0
+        entropy = 0.0
         if prob_0 > 0:
-            entropy -= prob_0 * np.log2(prob_0)
+            entropy -= prob_0 * math.log2(prob_0)
         if prob_1 > 0:
-            entropy -= prob_1 * np.log2(prob_1)
+            entropy -= prob_1 * math.log2(prob_1)
         
-        return {
+        self._stats = {
             'total_measurements': total,
             'count_0': count_0,
             'count_1': count_1,
@@ -138,11 +282,41 @@ class QuantumRandomNumberGenerator:
             'max_entropy': 1.0,
             'entropy_ratio': entropy / 1.0
         }
+        return self._stats
+    
+    def formatted_stats(self):
+        """
+        Get the statistics formatted for display, computed once per batch.
+        
+        Returns:
+            FormattedStatistics: Preformatted statistics strings
+        """
+        if self._formatted_stats is None:
+            # Shares the statistics dict cached by get_statistics()
+            stats = self.get_statistics()
+            entropy_ratio = stats['entropy_ratio']
+            self._formatted_stats = FormattedStatistics(
+                total_measurements=str(stats['total_measurements']),
+                count_0=str(stats['count_0']),
+                count_1=str(stats['count_1']),
+                percent_0=f"{stats['probability_0'] * 100:.2f}%",
+                percent_1=f"{stats['probability_1'] * 100:.2f}%",
+                probability_0=f"{stats['probability_0']:.4f}",
+                probability_1=f"{stats['probability_1']:.4f}",
+                shannon_entropy=f"{stats['shannon_entropy']:.6f}",
+                max_entropy=f"{stats['max_entropy']:.6f}",
+                entropy_ratio=f"{entropy_ratio:.4f}",
+                quality='Excellent' if entropy_ratio > 0.95 else 'Good' if entropy_ratio > 0.85 else 'Poor'
+            )
+        return self._formatted_stats
     
     def reset(self):
         """Reset the generator state."""
-        self.measurements = []
+        self.measurements = np.empty(0, dtype=np.uint8)
         self.counts = {}
+        self._packed_int = None
+        self._stats = None
+        self._formatted_stats = None
 
 
 # Example usage
@@ -153,7 +327,7 @@ if __name__ == "__main__":
     bits = qrng.generate_random_bits(num_measurements=256)
     
     print("Random Bits (first 50):", ''.join(map(str, bits[:50])))
-    print("Binary String (first 50):", qrng.to_binary_string()[:50])
+    print("Binary String (first 50):", qrng.to_binary_string(limit=50))
     print("Decimal:", qrng.to_decimal())
     print("Hexadecimal:", qrng.to_hex())
     print("Float [0,1):", qrng.to_float())
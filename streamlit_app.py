@@ -4,6 +4,7 @@ Provides an interactive, user-friendly interface for quantum randomness generati
 """
 
 import streamlit as st
+import io
 import sys
 import os
 from pathlib import Path
@@ -12,9 +13,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from quantum_core import QuantumRandomNumberGenerator
-from visualizer import QuantumVisualizer
 from utils import FileManager, RandomnessTests, FormatConverter
-import matplotlib.pyplot as plt
+import numpy as np
 
 
 # Page configuration
@@ -40,6 +40,97 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 
+def pack_measurements(measurements):
+    """Pack measurements into bytes so they can serve as a compact cache key."""
+    return np.packbits(np.asarray(measurements, dtype=np.uint8)).tobytes()
+
+
+def unpack_measurements(m_bytes, n):
+    """Recover the first n measurement bits from packed bytes."""
+    return np.unpackbits(np.frombuffer(m_bytes, dtype=np.uint8), count=n)
+
+
+def qrng_from_packed(m_bytes, n):
+    """Build a simulator-free QRNG holding the given packed measurements."""
+    qrng = QuantumRandomNumberGenerator(backend="fast")
+    qrng.set_measurements(unpack_measurements(m_bytes, n))
+    return qrng
+
+
+@st.cache_data
+def cached_binary_string(m_bytes, n, limit=None):
+    """Binary string of the (first `limit`) measurements, cached across reruns."""
+    return qrng_from_packed(m_bytes, n).to_binary_string(limit=limit)
+
+
+@st.cache_data
+def cached_decimal(m_bytes, n):
+    """Decimal value of the measurements, cached across reruns."""
+    return qrng_from_packed(m_bytes, n).to_decimal()
+
+
+@st.cache_data
+def cached_hex(m_bytes, n):
+    """Hexadecimal value of the measurements, cached across reruns."""
+    return qrng_from_packed(m_bytes, n).to_hex()
+
+
+@st.cache_data
+def cached_float(m_bytes, n):
+    """Float value of the measurements, cached across reruns."""
+    return qrng_from_packed(m_bytes, n).to_float()
+
+
+@st.cache_data
+def cached_all_tests(m_bytes, n):
+    """Chi-square, runs and entropy test results, cached across reruns."""
+    return RandomnessTests.all_tests(unpack_measurements(m_bytes, n))
+
+
+def figure_png(fig):
+    """
+    Render a figure to PNG bytes, matching st.pyplot's defaults.
+    
+    Plots are cached as PNG bytes rather than live Figures, so no mutable
+    matplotlib object is shared between sessions.
+    """
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=200, bbox_inches="tight")
+    return buf.getvalue()
+
+
+@st.cache_data
+def cached_bloch_sphere():
+    """Bloch sphere PNG, which does not depend on the measurements."""
+    from visualizer import QuantumVisualizer
+    
+    return figure_png(QuantumVisualizer.plot_bloch_sphere())
+
+
+@st.cache_data(max_entries=32, ttl=3600)
+def cached_measurement_histogram(m_bytes, n):
+    """Measurement histogram PNG, cached per measurement batch."""
+    from visualizer import QuantumVisualizer
+    
+    return figure_png(QuantumVisualizer.plot_measurement_histogram(unpack_measurements(m_bytes, n)))
+
+
+@st.cache_data(max_entries=32, ttl=3600)
+def cached_statistics_plot(stats):
+    """Statistics PNG, cached per statistics dictionary."""
+    from visualizer import QuantumVisualizer
+    
+    return figure_png(QuantumVisualizer.plot_statistics(stats))
+
+
+@st.cache_data(max_entries=32, ttl=3600)
+def cached_bit_sequence(m_bytes, n):
+    """Bit sequence PNG, cached per measurement batch."""
+    from visualizer import QuantumVisualizer
+    
+    return figure_png(QuantumVisualizer.plot_bit_sequence(unpack_measurements(m_bytes, n)))
+
+
 def init_session_state():
     """Initialize session state variables."""
     if 'qrng' not in st.session_state:
@@ -48,6 +139,8 @@ def init_session_state():
         st.session_state.measurements = None
     if 'stats' not in st.session_state:
         st.session_state.stats = None
+    if 'batch_settings' not in st.session_state:
+        st.session_state.batch_settings = None
 
 
 def main():
@@ -75,6 +168,14 @@ def main():
     if use_seed:
         seed = st.sidebar.number_input("Seed Value", value=42, step=1)
     
+    fast_mode = st.sidebar.checkbox(
+        "Fast Mode",
+        value=False,
+        help="Sample statistically equivalent fair coin flips instead of "
+             "running the quantum simulator, for a more responsive UI"
+    )
+    backend = "fast" if fast_mode else "aer"
+    
     # Main tabs
     tab1, tab2, tab3, tab4, tab5 = st.tabs([
         "Generate", "Analyze", "Visualize", "Compare", "About"
@@ -89,13 +190,14 @@ def main():
         with col1:
             if st.button("Generate Random Numbers", key="gen_btn", use_container_width=True):
                 with st.spinner("Generating quantum random numbers..."):
-                    qrng = QuantumRandomNumberGenerator(seed=seed)
+                    qrng = QuantumRandomNumberGenerator(seed=seed, backend=backend)
                     measurements = qrng.generate_random_bits(num_measurements=num_measurements)
                     stats = qrng.get_statistics()
                     
                     st.session_state.qrng = qrng
                     st.session_state.measurements = measurements
                     st.session_state.stats = stats
+                    st.session_state.batch_settings = (num_measurements, seed, backend)
                     
                     st.success("Random numbers generated successfully!")
         
@@ -105,47 +207,49 @@ def main():
             # Display results
             st.subheader("Results")
             
+            formatted = st.session_state.qrng.formatted_stats()
+            
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                st.metric("Total Bits", st.session_state.stats['total_measurements'])
+                st.metric("Total Bits", formatted.total_measurements)
             
             with col2:
-                st.metric("Count of 0s", st.session_state.stats['count_0'])
+                st.metric("Count of 0s", formatted.count_0)
             
             with col3:
-                st.metric("Count of 1s", st.session_state.stats['count_1'])
+                st.metric("Count of 1s", formatted.count_1)
             
             with col4:
-                entropy_ratio = st.session_state.stats['entropy_ratio']
-                quality = "Excellent" if entropy_ratio > 0.95 else "Good" if entropy_ratio > 0.85 else "Poor"
-                st.metric("Entropy Ratio", f"{entropy_ratio:.4f}", delta=quality)
+                st.metric("Entropy Ratio", formatted.entropy_ratio, delta=formatted.quality)
             
             st.divider()
             
             # Display formats
             st.subheader("Output Formats")
             
+            m_bytes = pack_measurements(st.session_state.measurements)
+            n = len(st.session_state.measurements)
+            
             col1, col2 = st.columns(2)
             
             with col1:
                 st.write("**Binary (first 100 bits):**")
-                binary_str = st.session_state.qrng.to_binary_string()
-                st.code(binary_str[:100], language="text")
+                st.code(cached_binary_string(m_bytes, n, limit=100), language="text")
             
             with col2:
                 st.write("**Decimal:**")
-                st.code(str(st.session_state.qrng.to_decimal()), language="text")
+                st.code(str(cached_decimal(m_bytes, n)), language="text")
             
             col1, col2 = st.columns(2)
             
             with col1:
                 st.write("**Hexadecimal:**")
-                st.code(st.session_state.qrng.to_hex(), language="text")
+                st.code(cached_hex(m_bytes, n), language="text")
             
             with col2:
                 st.write("**Float [0,1):**")
-                st.code(f"{st.session_state.qrng.to_float():.10f}", language="text")
+                st.code(f"{cached_float(m_bytes, n):.10f}", language="text")
             
             st.divider()
             
@@ -155,32 +259,26 @@ def main():
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                json_data = FileManager.save_measurements(
-                    st.session_state.measurements, 
-                    "temp.json"
+                st.download_button(
+                    label="Download as JSON",
+                    data=FileManager.dumps_measurements(st.session_state.measurements),
+                    file_name="quantum_measurements.json",
+                    mime="application/json"
                 )
-                with open("temp.json", "r") as f:
-                    st.download_button(
-                        label="Download as JSON",
-                        data=f.read(),
-                        file_name="quantum_measurements.json",
-                        mime="application/json"
-                    )
             
             with col2:
-                binary_str = st.session_state.qrng.to_binary_string()
                 st.download_button(
                     label="Download as Binary",
-                    data=binary_str,
+                    # Bit-packed bytes, the same format as FileManager.save_as_binary_file
+                    data=m_bytes,
                     file_name="quantum_random.bin",
-                    mime="text/plain"
+                    mime="application/octet-stream"
                 )
             
             with col3:
-                hex_str = st.session_state.qrng.to_hex()
                 st.download_button(
                     label="Download as Hex",
-                    data=hex_str,
+                    data=cached_hex(m_bytes, n),
                     file_name="quantum_random.hex",
                     mime="text/plain"
                 )
@@ -195,15 +293,14 @@ def main():
             else:
                 with st.spinner("Running randomness tests..."):
                     measurements = st.session_state.measurements
+                    m_bytes = pack_measurements(measurements)
+                    n = len(measurements)
                     
-                    # Chi-square test
-                    chi_square = RandomnessTests.chi_square_test(measurements)
-                    
-                    # Runs test
-                    runs = RandomnessTests.runs_test(measurements)
-                    
-                    # Entropy test
-                    entropy = RandomnessTests.entropy_test(measurements)
+                    # Chi-square, runs and entropy tests in a single pass
+                    results = cached_all_tests(m_bytes, n)
+                    chi_square = results['chi_square']
+                    runs = results['runs']
+                    entropy = results['entropy']
                     
                     st.success("Analysis complete!")
                     
@@ -266,36 +363,29 @@ def main():
                 st.warning("Please generate random numbers first in the Generate tab.")
             else:
                 with st.spinner("Generating visualizations..."):
-                    measurements = st.session_state.measurements
+                    m_bytes = pack_measurements(st.session_state.measurements)
+                    n = len(st.session_state.measurements)
                     stats = st.session_state.stats
                     
                     col1, col2 = st.columns(2)
                     
                     with col1:
                         st.subheader("Measurement Histogram")
-                        fig = QuantumVisualizer.plot_measurement_histogram(measurements)
-                        st.pyplot(fig)
-                        plt.close(fig)
+                        st.image(cached_measurement_histogram(m_bytes, n))
                     
                     with col2:
                         st.subheader("Bloch Sphere")
-                        fig = QuantumVisualizer.plot_bloch_sphere()
-                        st.pyplot(fig)
-                        plt.close(fig)
+                        st.image(cached_bloch_sphere())
                     
                     col1, col2 = st.columns(2)
                     
                     with col1:
                         st.subheader("Statistics")
-                        fig = QuantumVisualizer.plot_statistics(stats)
-                        st.pyplot(fig)
-                        plt.close(fig)
+                        st.image(cached_statistics_plot(stats))
                     
                     with col2:
                         st.subheader("Bit Sequence Analysis")
-                        fig = QuantumVisualizer.plot_bit_sequence(measurements)
-                        st.pyplot(fig)
-                        plt.close(fig)
+                        st.image(cached_bit_sequence(m_bytes, n))
     
     # TAB 4: Compare
     with tab4:
@@ -303,13 +393,16 @@ def main():
         
         if st.button("Run Comparison", key="cmp_btn", use_container_width=True):
             with st.spinner("Comparing quantum and classical randomness..."):
-                # Generate quantum
-                qrng = QuantumRandomNumberGenerator(seed=seed)
-                quantum_measurements = qrng.generate_random_bits(num_measurements=num_measurements)
-                quantum_stats = qrng.get_statistics()
+                # Reuse the generated measurements when they match the current settings
+                if st.session_state.batch_settings == (num_measurements, seed, backend):
+                    quantum_stats = st.session_state.qrng.formatted_stats()
+                else:
+                    qrng = QuantumRandomNumberGenerator(seed=seed, backend=backend)
+                    qrng.generate_random_bits(num_measurements=num_measurements)
+                    quantum_stats = qrng.formatted_stats()
                 
                 # Get classical
-                classical_stats = RandomnessTests.compare_with_classical_random(num_measurements)
+                classical_stats = RandomnessTests.compare_with_classical_random(num_measurements, seed=seed)
                 
                 st.success("Comparison complete!")
                 
@@ -317,11 +410,11 @@ def main():
                 
                 with col1:
                     st.subheader("Quantum Random Numbers")
-                    st.metric("Count of 0s", quantum_stats['count_0'])
-                    st.metric("Count of 1s", quantum_stats['count_1'])
-                    st.metric("Probability of 0", f"{quantum_stats['probability_0']:.4f}")
-                    st.metric("Probability of 1", f"{quantum_stats['probability_1']:.4f}")
-                    st.metric("Shannon Entropy", f"{quantum_stats['shannon_entropy']:.6f}")
+                    st.metric("Count of 0s", quantum_stats.count_0)
+                    st.metric("Count of 1s", quantum_stats.count_1)
+                    st.metric("Probability of 0", quantum_stats.probability_0)
+                    st.metric("Probability of 1", quantum_stats.probability_1)
+                    st.metric("Shannon Entropy", quantum_stats.shannon_entropy)
                 
                 with col2:
                     st.subheader("Classical Random Numbers")
@@ -350,10 +443,10 @@ def main():
         
         This application generates true random numbers using quantum mechanics principles:
         
-        1. **Quantum Superposition**: A single qubit is initialized in the |0⟩ state
-        2. **Hadamard Gate**: Applied to create an equal superposition of |0⟩ and |1⟩
-        3. **Measurement**: The qubit is measured, collapsing to either 0 or 1 with 50% probability
-        4. **Repetition**: This process is repeated to generate multiple random bits
+        1. **Quantum Superposition**: A register of 64 qubits is initialized in the |0⟩ state
+        2. **Hadamard Gate**: Applied to each qubit to create an equal superposition of |0⟩ and |1⟩
+        3. **Measurement**: Every qubit is measured, collapsing to either 0 or 1 with 50% probability
+        4. **Repetition**: The circuit is run for as many shots as needed, each contributing 64 random bits
         
         ## Why Quantum Randomness?
         
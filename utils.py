@@ -3,33 +3,132 @@ Utility functions for quantum random number generator.
 Includes file I/O, format conversion, and randomness quality tests.
 """
 
+import base64
+import binascii
 import json
-import random
+import math
+import struct
+from functools import lru_cache
 from datetime import datetime
 from scipy import stats as scipy_stats
 import numpy as np
 
+# Frozen distributions used for p-values, created once at import time
+_CHI2_DF1 = scipy_stats.chi2(df=1)
+_NORM = scipy_stats.norm()
+
+# Scale factor mapping a 32-bit unsigned integer onto [0, 1)
+_INV_2_32 = 1.0 / (1 << 32)
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard json module is used instead
+    orjson = None
+
+# Arrays longer than this are handed to the parallel Numba kernel. Importing
+# Numba and the first kernel call cost about 0.4 s, while the kernel saves
+# about 3.5 ns per bit over NumPy, so it only pays off on very long arrays
+_FUSED_STATS_THRESHOLD = 100_000_000
+
+
+def _json_dumps(data):
+    """Serialize data to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def _json_loads(raw):
+    """Deserialize JSON from bytes."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def count_bits(measurements):
+    """
+    Count 0s and 1s in a single pass.
+    
+    Args:
+        measurements (numpy.ndarray): uint8 array of measurement results
+    
+    Returns:
+        tuple: (count_0, count_1) as Python ints
+    """
+    counts = np.bincount(np.asarray(measurements, dtype=np.uint8), minlength=2)
+    return int(counts[0]), int(counts[1])
+
+
+@lru_cache(maxsize=None)
+def _fused_stats_kernel():
+    """The optional Numba kernel, imported on first use; None without Numba."""
+    try:
+        from _fast import fused_stats
+    except ImportError:  # Numba is optional; the NumPy path is used instead
+        return None
+    return fused_stats
+
+
+# Shared generator for unseeded classical samples
+_rng = np.random.default_rng()
+
+
+@lru_cache(maxsize=16)
+def _classical_bits(num_samples, seed):
+    """Pseudo-random bits from NumPy's default (PCG64) generator."""
+    # Draw from a child stream of the seed so the classical bits never
+    # repeat the 'fast' backend's bits for the same seed
+    stream = np.random.SeedSequence(seed).spawn(1)[0]
+    bits = np.random.default_rng(stream).integers(0, 2, num_samples, dtype=np.uint8)
+    # Cached arrays are shared between callers, so keep them immutable
+    bits.flags.writeable = False
+    return bits
+
 
 class FileManager:
     """Handles saving and loading random number data."""
     
+    # Encoding tag for bit-packed, base64 encoded measurements in JSON files
+    MEASUREMENT_ENCODING = 'packbits-base64'
+    
+    # Buffer size for output files; all writers emit bytes in binary mode
+    WRITE_BUFFER_SIZE = 1 << 20
+    
     @staticmethod
-    def save_measurements(measurements, filename):
+    def dumps_measurements(measurements):
         """
-        Save measurements to a JSON file.
+        Serialize measurements to JSON in memory.
+        
+        The bits are packed eight per byte and stored base64 encoded under
+        'measurements', with 'encoding' set to MEASUREMENT_ENCODING.
         
         Args:
-            measurements (list): List of measurement results
-            filename (str): Output filename
+            measurements (numpy.ndarray): uint8 array of measurement results
+        
+        Returns:
+            bytes: UTF-8 encoded JSON document
         """
+        packed = np.packbits(np.asarray(measurements, dtype=np.uint8))
         data = {
             'timestamp': datetime.now().isoformat(),
-            'measurements': measurements,
+            'encoding': FileManager.MEASUREMENT_ENCODING,
+            'measurements': base64.b64encode(packed.tobytes()).decode('ascii'),
             'count': len(measurements)
         }
         
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        return _json_dumps(data)
+    
+    @staticmethod
+    def save_measurements(measurements, filename):
+        """
+        Save measurements to a JSON file.
+        
+        Args:
+            measurements (numpy.ndarray): uint8 array of measurement results
+            filename (str): Output filename
+        """
+        with open(filename, 'wb', buffering=FileManager.WRITE_BUFFER_SIZE) as f:
+            f.write(FileManager.dumps_measurements(measurements))
         
         print(f"Measurements saved to {filename}")
     
@@ -42,26 +141,42 @@ class FileManager:
             filename (str): Input filename
         
         Returns:
-            list: List of measurement results
+            numpy.ndarray: uint8 array of measurement results
         """
-        with open(filename, 'r') as f:
-            data = json.load(f)
+        with open(filename, 'rb') as f:
+            data = _json_loads(f.read())
         
-        return data['measurements']
+        if data.get('encoding') == FileManager.MEASUREMENT_ENCODING:
+            packed = np.frombuffer(base64.b64decode(data['measurements']), dtype=np.uint8)
+            return np.unpackbits(packed, count=data['count'])
+        
+        # Older files store the measurements as a plain list of 0s and 1s
+        return np.asarray(data['measurements'], dtype=np.uint8)
     
     @staticmethod
-    def save_as_binary_file(measurements, filename):
+    def save_as_binary_file(measurements, filename, readable=False):
         """
-        Save measurements as binary file (one bit per byte for readability).
+        Save measurements as binary file.
+        
+        Bits are packed eight per byte (most significant bit first, last
+        byte zero padded) unless `readable` is set.
         
         Args:
-            measurements (list): List of measurement results
+            measurements (numpy.ndarray): uint8 array of measurement results
             filename (str): Output filename
+            readable (bool): Write one ASCII '0'/'1' character per bit instead
         """
-        binary_str = ''.join(map(str, measurements))
-        
-        with open(filename, 'w') as f:
-            f.write(binary_str)
+        if readable:
+            # Offset each bit by ord('0') to get its ASCII digit in one pass
+            ascii_bits = np.asarray(measurements, dtype=np.uint8) + ord('0')
+            
+            with open(filename, 'wb', buffering=FileManager.WRITE_BUFFER_SIZE) as f:
+                f.write(ascii_bits.tobytes())
+        else:
+            packed = np.packbits(np.asarray(measurements, dtype=np.uint8))
+            
+            with open(filename, 'wb', buffering=FileManager.WRITE_BUFFER_SIZE) as f:
+                f.write(packed.tobytes())
         
         print(f"Binary data saved to {filename}")
     
@@ -71,23 +186,32 @@ class FileManager:
         Save measurements as hexadecimal file.
         
         Args:
-            measurements (list): List of measurement results
+            measurements (numpy.ndarray): uint8 array of measurement results
             filename (str): Output filename
         """
-        binary_str = ''.join(map(str, measurements))
-        # Pad to multiple of 4 for hex conversion
-        binary_str = binary_str.ljust((len(binary_str) + 3) // 4 * 4, '0')
-        
-        hex_str = hex(int(binary_str, 2))[2:]
+        arr = np.asarray(measurements, dtype=np.uint8)
+        # packbits zero pads to whole bytes; keep one hex digit per 4 bits
+        packed = np.packbits(arr)
+        hex_bytes = binascii.hexlify(packed.tobytes())[:(len(arr) + 3) // 4]
         
-        with open(filename, 'w') as f:
-            f.write(hex_str)
+        with open(filename, 'wb', buffering=FileManager.WRITE_BUFFER_SIZE) as f:
+            f.write(hex_bytes)
         
         print(f"Hexadecimal data saved to {filename}")
 
 
 class RandomnessTests:
-    """Statistical tests for randomness quality."""
+    """
+    Statistical tests for randomness quality.
+    
+    Measurements are handled as contiguous uint8 NumPy arrays; other
+    sequences of 0s and 1s are converted once on entry.
+    """
+    
+    @staticmethod
+    def _coerce(measurements):
+        """Return measurements as a contiguous uint8 array, copying only when needed."""
+        return np.ascontiguousarray(measurements, dtype=np.uint8)
     
     @staticmethod
     def chi_square_test(measurements, expected_prob=0.5):
@@ -95,15 +219,81 @@ class RandomnessTests:
         Perform chi-square test for randomness.
         
         Args:
-            measurements (list): List of measurement results
+            measurements (numpy.ndarray): uint8 array of measurement results
             expected_prob (float): Expected probability for each outcome
         
         Returns:
             dict: Test results including chi-square statistic and p-value
         """
-        count_0 = measurements.count(0)
-        count_1 = measurements.count(1)
-        total = len(measurements)
+        return RandomnessTests.all_tests(measurements, expected_prob)['chi_square']
+    
+    @staticmethod
+    def runs_test(measurements):
+        """
+        Perform runs test for randomness (tests for clustering).
+        
+        Args:
+            measurements (numpy.ndarray): uint8 array of measurement results
+        
+        Returns:
+            dict: Test results including runs count and p-value
+        """
+        return RandomnessTests.all_tests(measurements)['runs']
+    
+    @staticmethod
+    def entropy_test(measurements):
+        """
+        Calculate Shannon entropy and compare to theoretical maximum.
+        
+        Args:
+            measurements (numpy.ndarray): uint8 array of measurement results
+        
+        Returns:
+            dict: Entropy metrics
+        """
+        return RandomnessTests.all_tests(measurements)['entropy']
+    
+    @staticmethod
+    def all_tests(measurements, expected_prob=0.5):
+        """
+        Run the chi-square, runs and entropy tests in one vectorized sweep.
+        
+        The individual test methods delegate here, so the array is coerced
+        and scanned once however the results are requested.
+        
+        Args:
+            measurements (numpy.ndarray): uint8 array of measurement results
+            expected_prob (float): Expected probability for each outcome
+        
+        Returns:
+            dict: Bit counts, plus the results of each test under
+                'chi_square', 'runs' and 'entropy'
+        """
+        arr = RandomnessTests._coerce(measurements)
+        total = len(arr)
+        
+        fused_stats = _fused_stats_kernel() if total > _FUSED_STATS_THRESHOLD else None
+        if fused_stats is not None:
+            # Compiled kernel reads the buffer once without temporary arrays
+            count_0, count_1, transitions = (int(v) for v in fused_stats(arr))
+        else:
+            count_0, count_1 = count_bits(arr)
+            # Every transition between neighbouring bits starts a new run
+            transitions = int(np.count_nonzero(np.bitwise_xor(arr[:-1], arr[1:])))
+        runs = transitions + 1
+        
+        return {
+            'count_0': count_0,
+            'count_1': count_1,
+            'chi_square': RandomnessTests._chi_square_from_counts(count_0, count_1, expected_prob),
+            'runs': RandomnessTests._runs_from_counts(runs, count_0, count_1),
+            'entropy': RandomnessTests._entropy_from_counts(count_0, count_1)
+        }
+    
+    @staticmethod
+    def _chi_square_from_counts(count_0, count_1, expected_prob=0.5):
+        """Chi-square test results from the counts of 0s and 1s."""
+        total = count_0 + count_1
         
         expected_count = total * expected_prob
         
@@ -111,7 +301,8 @@ class RandomnessTests:
                       (count_1 - expected_count) ** 2 / expected_count)
         
         # p-value from chi-square distribution with 1 degree of freedom
-        p_value = 1 - scipy_stats.chi2.cdf(chi_square, df=1)
+        # (survival function avoids cancellation in 1 - cdf near zero)
+        p_value = _CHI2_DF1.sf(chi_square)
         
         return {
             'chi_square_statistic': chi_square,
@@ -121,25 +312,9 @@ class RandomnessTests:
         }
     
     @staticmethod
-    def runs_test(measurements):
-        """
-        Perform runs test for randomness (tests for clustering).
-        
-        Args:
-            measurements (list): List of measurement results
-        
-        Returns:
-            dict: Test results including runs count and p-value
-        """
-        # Count runs (consecutive identical values)
-        runs = 1
-        for i in range(1, len(measurements)):
-            if measurements[i] != measurements[i-1]:
-                runs += 1
-        
-        n0 = measurements.count(0)
-        n1 = measurements.count(1)
-        n = len(measurements)
+    def _runs_from_counts(runs, n0, n1):
+        """Runs test results from the runs count and the counts of 0s and 1s."""
+        n = n0 + n1
         
         # Expected number of runs
         expected_runs = (2 * n0 * n1) / n + 1
@@ -147,11 +322,12 @@ class RandomnessTests:
         # Variance of runs
         variance = (2 * n0 * n1 * (2 * n0 * n1 - n)) / (n ** 2 * (n - 1))
         
-        # Z-score
-        z_score = (runs - expected_runs) / np.sqrt(variance)
+        # Z-score (undefined when every bit has the same value)
+        std = math.sqrt(variance)
+        z_score = (runs - expected_runs) / std if std > 0 else float('nan')
         
         # p-value from normal distribution
-        p_value = 2 * (1 - scipy_stats.norm.cdf(abs(z_score)))
+        p_value = 2 * _NORM.sf(abs(z_score))
         
         return {
             'runs_count': runs,
@@ -163,19 +339,9 @@ class RandomnessTests:
         }
     
     @staticmethod
-    def entropy_test(measurements):
-        """
-        Calculate Shannon entropy and compare to theoretical maximum.
-        
-        Args:
-            measurements (list): List of measurement results
-        
-        Returns:
-            dict: Entropy metrics
-        """
-        total = len(measurements)
-        count_0 = measurements.count(0)
-        count_1 = measurements.count(1)
+    def _entropy_from_counts(count_0, count_1):
+        """Entropy metrics from the counts of 0s and 1s."""
+        total = count_0 + count_1
         
         prob_0 = count_0 / total
         prob_1 = count_1 / total
@@ -183,9 +349,9 @@ class RandomnessTests:
         # Shannon entropy
         entropy = 0
         if prob_0 > 0:
-            entropy -= prob_0 * np.log2(prob_0)
+            entropy -= prob_0 * math.log2(prob_0)
         if prob_1 > 0:
-            entropy -= prob_1 * np.log2(prob_1)
+            entropy -= prob_1 * math.log2(prob_1)
         
         max_entropy = 1.0
         entropy_ratio = entropy / max_entropy
@@ -198,26 +364,34 @@ class RandomnessTests:
         }
     
     @staticmethod
-    def compare_with_classical_random(num_samples=1024):
+    def compare_with_classical_random(num_samples=1024, seed=None):
         """
         Generate classical random numbers and compare statistics.
         
         Args:
             num_samples (int): Number of samples to generate
+            seed (int, optional): Seed for reproducible samples; seeded
+                samples are memoized
         
         Returns:
-            dict: Comparison statistics
+            dict: Comparison statistics, with the full randomness test
+                results of the classical bits under 'tests'
         """
-        classical_bits = [random.randint(0, 1) for _ in range(num_samples)]
+        if seed is None:
+            classical_bits = _rng.integers(0, 2, num_samples, dtype=np.uint8)
+        else:
+            classical_bits = _classical_bits(num_samples, seed)
         
-        count_0 = classical_bits.count(0)
-        count_1 = classical_bits.count(1)
+        tests = RandomnessTests.all_tests(classical_bits)
+        count_0 = tests['count_0']
+        count_1 = tests['count_1']
         
         return {
             'count_0': count_0,
             'count_1': count_1,
             'probability_0': count_0 / num_samples,
-            'probability_1': count_1 / num_samples
+            'probability_1': count_1 / num_samples,
+            'tests': tests
         }
 
 
@@ -239,8 +413,21 @@ class FormatConverter:
     def binary_to_float(binary_str):
         """Convert binary string to float [0, 1)."""
         binary_str = binary_str.ljust(32, '0')[:32]
-        decimal = int(binary_str, 2)
-        return decimal / (2 ** 32)
+        return int(binary_str, 2) * _INV_2_32
+    
+    @staticmethod
+    def binary_to_float_from_bytes(packed):
+        """
+        Convert bit-packed bytes to float [0, 1).
+        
+        Args:
+            packed (bytes): Bits packed most significant bit first; only the
+                first 4 bytes are used and shorter input is zero padded
+        
+        Returns:
+            float: Same value as binary_to_float on the equivalent bit string
+        """
+        return struct.unpack('>I', packed[:4].ljust(4, b'\x00'))[0] * _INV_2_32
     
     @staticmethod
     def decimal_to_binary(decimal):
@@ -266,16 +453,12 @@ if __name__ == "__main__":
     FileManager.save_as_binary_file(measurements, "quantum_random.bin")
     FileManager.save_as_hex_file(measurements, "quantum_random.hex")
     
-    # Run randomness tests
+    # Run all randomness tests in a single pass
     print("\n=== Randomness Quality Tests ===")
-    chi_square = RandomnessTests.chi_square_test(measurements)
-    print(f"Chi-Square Test: {chi_square}")
-    
-    runs = RandomnessTests.runs_test(measurements)
-    print(f"Runs Test: {runs}")
-    
-    entropy = RandomnessTests.entropy_test(measurements)
-    print(f"Entropy Test: {entropy}")
+    results = RandomnessTests.all_tests(measurements)
+    print(f"Chi-Square Test: {results['chi_square']}")
+    print(f"Runs Test: {results['runs']}")
+    print(f"Entropy Test: {results['entropy']}")
     
     # Compare with classical random
     classical = RandomnessTests.compare_with_classical_random(1024)
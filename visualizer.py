@@ -3,35 +3,67 @@ Visualization module for quantum random number generator.
 Provides histogram and Bloch sphere visualizations.
 """
 
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import numpy as np
+from qiskit.quantum_info import Statevector
 from qiskit.visualization import plot_bloch_multivector
-from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
-from qiskit_aer import AerSimulator
+
+from utils import count_bits
+
+
+# State after applying a Hadamard gate to |0>, i.e. (|0> + |1>) / sqrt(2)
+_HADAMARD_STATE = Statevector([1 / np.sqrt(2), 1 / np.sqrt(2)])
 
 
 class QuantumVisualizer:
-    """Handles visualization of quantum measurements and states."""
+    """
+    Handles visualization of quantum measurements and states.
+    
+    Figures are built as standalone matplotlib Figure objects rather than
+    through pyplot, so they are not retained by pyplot's global registry.
+    """
+    
+    @staticmethod
+    def _prepare_figure(reuse_fig, figsize):
+        """
+        Get a blank figure of the given size, reusing `reuse_fig` if provided.
+        
+        Args:
+            reuse_fig (matplotlib.figure.Figure, optional): Figure to clear and resize
+            figsize (tuple): Figure size in inches
+        
+        Returns:
+            matplotlib.figure.Figure: Figure ready to draw into
+        """
+        if reuse_fig is None:
+            return Figure(figsize=figsize)
+        
+        reuse_fig.clear()
+        reuse_fig.set_size_inches(figsize)
+        return reuse_fig
     
     @staticmethod
     def plot_measurement_histogram(measurements, title="Quantum Measurement Results", 
-                                   save_path=None):
+                                   save_path=None, reuse_fig=None, dpi=150):
         """
         Plot histogram of measurement results (0s vs 1s).
         
         Args:
-            measurements (list): List of measurement results (0 or 1)
+            measurements (numpy.ndarray): uint8 array of measurement results (0 or 1)
             title (str): Title for the plot
             save_path (str, optional): Path to save the figure
+            reuse_fig (matplotlib.figure.Figure, optional): Existing figure to
+                clear and draw into instead of creating a new one
+            dpi (int): Resolution used when saving the figure (default: 150)
         
         Returns:
             matplotlib.figure.Figure: The figure object
         """
-        count_0 = measurements.count(0)
-        count_1 = measurements.count(1)
-        total = len(measurements)
+        count_0, count_1 = count_bits(measurements)
+        total = count_0 + count_1
         
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig = QuantumVisualizer._prepare_figure(reuse_fig, figsize=(10, 6))
+        ax = fig.subplots()
         
         # Create bar chart
         bars = ax.bar(['0', '1'], [count_0, count_1], color=['#3498db', '#e74c3c'], 
@@ -50,59 +82,52 @@ class QuantumVisualizer:
         ax.set_ylim(0, max(count_0, count_1) * 1.15)
         ax.grid(axis='y', alpha=0.3, linestyle='--')
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
         
         return fig
     
     @staticmethod
-    def plot_bloch_sphere(save_path=None):
+    def plot_bloch_sphere(save_path=None, dpi=150):
         """
         Plot Bloch sphere showing superposition state after Hadamard gate.
         
         Args:
             save_path (str, optional): Path to save the figure
+            dpi (int): Resolution used when saving the figure (default: 150)
         
         Returns:
             matplotlib.figure.Figure: The figure object
         """
-        # Create circuit with Hadamard gate
-        qr = QuantumRegister(1, 'q')
-        circuit = QuantumCircuit(qr)
-        circuit.h(qr[0])
-        circuit.save_statevector()
-        
-        # Get statevector
-        simulator = AerSimulator(method='statevector')
-        job = simulator.run(circuit)
-        result = job.result()
-        statevector = result.get_statevector(circuit)
-        
         # Plot Bloch sphere
-        fig = plot_bloch_multivector(statevector)
+        fig = plot_bloch_multivector(_HADAMARD_STATE)
         fig.suptitle('Bloch Sphere: Qubit State After Hadamard Gate', 
                      fontsize=14, fontweight='bold', y=0.98)
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
         
         return fig
     
     @staticmethod
-    def plot_statistics(stats, save_path=None):
+    def plot_statistics(stats, save_path=None, reuse_fig=None, dpi=150):
         """
         Plot statistical analysis of measurements.
         
         Args:
             stats (dict): Statistics dictionary from QRNG
             save_path (str, optional): Path to save the figure
+            reuse_fig (matplotlib.figure.Figure, optional): Existing figure to
+                clear and draw into instead of creating a new one
+            dpi (int): Resolution used when saving the figure (default: 150)
         
         Returns:
             matplotlib.figure.Figure: The figure object
         """
-        fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+        fig = QuantumVisualizer._prepare_figure(reuse_fig, figsize=(14, 5))
+        axes = fig.subplots(1, 2)
         
         # Probability distribution
         ax1 = axes[0]
@@ -140,39 +165,44 @@ class QuantumVisualizer:
         ax2.legend(loc='lower right')
         ax2.grid(axis='x', alpha=0.3, linestyle='--')
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
         
         return fig
     
     @staticmethod
-    def plot_bit_sequence(measurements, window_size=100, save_path=None):
+    def plot_bit_sequence(measurements, window_size=100, save_path=None, reuse_fig=None,
+                          dpi=150):
         """
         Plot running average of bit values to visualize randomness over time.
         
         Args:
-            measurements (list): List of measurement results
+            measurements (numpy.ndarray): uint8 array of measurement results
             window_size (int): Size of moving window for averaging
             save_path (str, optional): Path to save the figure
+            reuse_fig (matplotlib.figure.Figure, optional): Existing figure to
+                clear and draw into instead of creating a new one
+            dpi (int): Resolution used when saving the figure (default: 150)
         
         Returns:
             matplotlib.figure.Figure: The figure object
         """
-        # Calculate running average
-        running_avg = []
-        for i in range(len(measurements) - window_size + 1):
-            window = measurements[i:i+window_size]
-            avg = sum(window) / len(window)
-            running_avg.append(avg)
+        # Calculate running average from a cumulative sum in O(n)
+        arr = np.asarray(measurements, dtype=np.float64)
+        csum = np.concatenate(([0.0], np.cumsum(arr)))
+        running_avg = (csum[window_size:] - csum[:-window_size]) / window_size
         
-        fig, ax = plt.subplots(figsize=(12, 6))
+        fig = QuantumVisualizer._prepare_figure(reuse_fig, figsize=(12, 6))
+        ax = fig.subplots()
         
-        ax.plot(running_avg, linewidth=2, color='#3498db', label=f'Running Average (window={window_size})')
+        # Rasterize the long per-measurement artists so saved files stay small
+        ax.plot(running_avg, linewidth=2, color='#3498db', label=f'Running Average (window={window_size})',
+                rasterized=True)
         ax.axhline(y=0.5, color='green', linestyle='--', linewidth=2, label='Ideal (0.5)')
         ax.fill_between(range(len(running_avg)), 0.45, 0.55, alpha=0.2, color='green', 
-                        label='±5% tolerance')
+                        label='±5% tolerance', rasterized=True)
         
         ax.set_xlabel('Measurement Index', fontsize=12, fontweight='bold')
         ax.set_ylabel('Average Bit Value', fontsize=12, fontweight='bold')
@@ -181,10 +211,10 @@ class QuantumVisualizer:
         ax.legend(loc='best')
         ax.grid(alpha=0.3, linestyle='--')
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
         
         return fig
 